@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from mlxtend.frequent_patterns import fpgrowth, association_rules
+
+from bitset_apriori import pack_baskets, frequent_itemsets as bitset_itemsets
+
+# ---------------------------
+# Frequent itemsets
+# ---------------------------
+# A dense boolean basket costs one byte per (order, product) cell
+DENSE_BASKET_CELLS = 50_000_000
+
+def one_hot_basket(order_idx, product_idx, n_orders, products):
+    """
+    Builds the boolean one-hot basket for mlxtend: dense while it fits in
+    DENSE_BASKET_CELLS, sparse CSR beyond that.
+    """
+    if n_orders * len(products) <= DENSE_BASKET_CELLS:
+        basket = np.zeros((n_orders, len(products)), dtype=bool)
+        basket[order_idx, product_idx] = True
+        return pd.DataFrame(basket, columns=products, copy=False)
+    basket = sp.csr_matrix((np.ones(len(order_idx), dtype=bool), (order_idx, product_idx)),
+                           shape=(n_orders, len(products)))
+    return pd.DataFrame.sparse.from_spmatrix(basket, columns=products)
+
+def find_itemsets(baskets, min_support, algorithm):
+    """
+    Finds the frequent itemsets with mlxtend's FP-Growth or the bit-packed Apriori.
+    """
+    order_idx, product_idx, n_orders, products = baskets
+    if algorithm == "fpgrowth":
+        basket_sets = one_hot_basket(order_idx, product_idx, n_orders, products)
+        return fpgrowth(basket_sets, min_support=min_support, use_colnames=True)
+
+    words = pack_baskets(order_idx, product_idx, n_orders, len(products))
+    levels = bitset_itemsets(words, product_idx, len(products), min_support)
+    return pd.DataFrame(
+        [(count / n_orders, frozenset(products[items])) for itemsets, counts in levels
+         for items, count in zip(itemsets, counts)],
+        columns=['support', 'itemsets'])
+
+# ---------------------------
+# Association rules
+# ---------------------------
+def prune_for_lift(frequent_itemsets, min_lift):
+    """
+    Drops itemsets that cannot yield a rule with lift >= min_lift, keeping
+    every subset association_rules still needs to look up.
+    """
+    if frequent_itemsets.empty:
+        return frequent_itemsets
+    support = dict(zip(frequent_itemsets['itemsets'], frequent_itemsets['support']))
+    # Any antecedent/consequent of an itemset lies inside one of its (k-1)-subsets,
+    # so the least frequent of those bounds lift from above: support / min_sub**2
+    min_sub = frequent_itemsets['itemsets'].map(
+        lambda s: min(support[s - {item}] for item in s) if len(s) > 1 else 1.0)
+    lengths = frequent_itemsets['itemsets'].map(len)
+    keep = (lengths == 1) | (frequent_itemsets['support'] / min_sub ** 2 >= min_lift)
+
+    retained = set(frequent_itemsets.loc[keep, 'itemsets'])
+    for k in range(lengths.max(), 2, -1):
+        for itemset in [s for s in retained if len(s) == k]:
+            retained.update(itemset - {item} for item in itemset)
+    return frequent_itemsets[frequent_itemsets['itemsets'].map(retained.__contains__)]
+
+def generate_rules(frequent_itemsets, min_confidence, min_lift):
+    """
+    Generates the rules meeting min_confidence and min_lift, with text columns for display.
+    """
+    if frequent_itemsets.empty:
+        # association_rules rejects an empty frame; no itemsets means no rules
+        return pd.DataFrame(columns=['antecedents_str', 'consequents_str', 'antecedents', 'consequents',
+                                     'support', 'confidence', 'lift'])
+    rules = association_rules(prune_for_lift(frequent_itemsets, min_lift),
+                              metric="confidence", min_threshold=min_confidence)
+    rules = rules[rules['lift'] >= min_lift].copy()
+    # Joined once per cached result, so the table never re-formats the frozensets
+    rules.insert(0, 'consequents_str', [', '.join(sorted(c)) for c in rules['consequents'].values])
+    rules.insert(0, 'antecedents_str', [', '.join(sorted(a)) for a in rules['antecedents'].values])
+    return rules
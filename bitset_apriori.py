@@ -0,0 +1,139 @@
+import threading
+
+import numpy as np
+from numba import njit, prange
+
+# Streamlit runs each session in its own thread, and numba's fallback workqueue
+# threading layer aborts the process if two parallel kernels run at once
+_kernel_lock = threading.Lock()
+
+# ---------------------------
+# Bit-packed baskets
+# ---------------------------
+def pack_baskets(order_idx, product_idx, n_orders, n_items):
+    """
+    Packs each order into ceil(n_items / 64) uint64 words, one bit per product.
+    """
+    words = np.zeros((n_orders, (n_items + 63) // 64), dtype=np.uint64)
+    bits = np.left_shift(np.uint64(1), (product_idx % 64).astype(np.uint64))
+    np.bitwise_or.at(words, (order_idx, product_idx // 64), bits)
+    return words
+
+def itemset_bits(candidates):
+    """
+    Locates each candidate item in the packed layout: its word index and its bit.
+    """
+    return (candidates // 64).astype(np.int64), np.left_shift(np.uint64(1), (candidates % 64).astype(np.uint64))
+
+@njit(parallel=True, cache=True)
+def count_supports(words, item_words, item_bits, counts):
+    """
+    Writes into counts[c] the number of orders containing every item of candidate c,
+    item t being bit item_bits[c, t] of word item_words[c, t].
+    """
+    # Candidates are independent reductions over the same words, one per thread;
+    # only the k words holding a candidate's items are read, however wide the catalogue
+    for c in prange(item_words.shape[0]):
+        total = 0
+        for i in range(words.shape[0]):
+            contained = 1
+            for t in range(item_words.shape[1]):
+                if words[i, item_words[c, t]] & item_bits[c, t] == 0:
+                    contained = 0
+                    break
+            total += contained
+        counts[c] = total
+
+# ---------------------------
+# Level-wise Apriori
+# ---------------------------
+@njit(cache=True)
+def _same_prefix(level, a, b):
+    for t in range(level.shape[1] - 1):
+        if level[a, t] != level[b, t]:
+            return False
+    return True
+
+@njit(cache=True)
+def _is_frequent(level, itemset):
+    """
+    Binary-searches the lexicographically sorted level for itemset.
+    """
+    lo, hi = 0, level.shape[0]
+    while lo < hi:
+        mid = (lo + hi) // 2
+        order = 0
+        for t in range(level.shape[1]):
+            if level[mid, t] != itemset[t]:
+                order = -1 if level[mid, t] < itemset[t] else 1
+                break
+        if order == 0:
+            return True
+        if order < 0:
+            lo = mid + 1
+        else:
+            hi = mid
+    return False
+
+@njit(cache=True)
+def apriori_gen(level):
+    """
+    Joins (k-1)-itemsets that share their first k-2 items, then drops every
+    candidate with an infrequent (k-1)-subset. level must be sorted
+    lexicographically; the candidates come out sorted the same way.
+    """
+    n, width = level.shape
+    # Rows sharing a prefix are contiguous: block_end[i] is one past row i's block
+    block_end = np.empty(n, dtype=np.int64)
+    for i in range(n - 1, -1, -1):
+        if i + 1 < n and _same_prefix(level, i, i + 1):
+            block_end[i] = block_end[i + 1]
+        else:
+            block_end[i] = i + 1
+    n_pairs = 0
+    for i in range(n):
+        n_pairs += block_end[i] - i - 1
+
+    candidates = np.empty((n_pairs, width + 1), dtype=level.dtype)
+    subset = np.empty(width, dtype=level.dtype)
+    m = 0
+    for i in range(n):
+        for j in range(i + 1, block_end[i]):
+            candidates[m, :width] = level[i]
+            candidates[m, width] = level[j, width - 1]
+            # Dropping either of the last two items gives back level[i] / level[j]
+            frequent = True
+            for drop in range(width - 1):
+                s = 0
+                for t in range(width + 1):
+                    if t != drop:
+                        subset[s] = candidates[m, t]
+                        s += 1
+                if not _is_frequent(level, subset):
+                    frequent = False
+                    break
+            if frequent:
+                m += 1
+    return candidates[:m]
+
+def frequent_itemsets(words, product_idx, n_items, min_support):
+    """
+    Returns one (itemsets, counts) pair per level, itemsets as sorted int32 item rows.
+    product_idx holds the product of each distinct (order, product) pair packed in words.
+    """
+    n_orders = words.shape[0]
+    levels = []
+    # Pairs are distinct, so an item's support count is just its number of pairs
+    counts = np.bincount(product_idx, minlength=n_items)
+    candidates = np.arange(n_items, dtype=np.int32)[:, None]
+    while len(candidates):
+        frequent = counts / n_orders >= min_support
+        if not frequent.any():
+            break
+        level = candidates[frequent]
+        levels.append((level, counts[frequent]))
+        candidates = apriori_gen(level)
+        counts = np.empty(len(candidates), dtype=np.int64)
+        with _kernel_lock:
+            count_supports(words, *itemset_bits(candidates), counts)
+    return levels
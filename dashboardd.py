@@ -1,37 +1,140 @@
 import streamlit as st
 import pandas as pd
-from mlxtend.frequent_patterns import apriori, association_rules
+import polars as pl
+import numpy as np
+import hashlib
+import diskcache
+from pathlib import Path
+from basket_mining import find_itemsets, generate_rules
 import networkx as nx
 from pyvis.network import Network
 import streamlit.components.v1 as components
-import tempfile
+
+# ---------------------------
+# Helper: Load baskets
+# ---------------------------
+# Uploads above this size are parsed in batches by Polars' streaming engine
+STREAMING_UPLOAD_BYTES = 64 * 1024 * 1024
+
+def scan_pairs(file_bytes, order_dtype):
+    """
+    Reads the distinct (order_id, product) pairs from the uploaded CSV.
+    """
+    # Lazy scan so only the two columns are parsed; blank cells are dropped like
+    # pandas' groupby did, and typed columns keep the duplicate drop on
+    # fixed-width codes instead of hashing strings
+    engine = "streaming" if len(file_bytes) > STREAMING_UPLOAD_BYTES else "auto"
+    return (pl.scan_csv(file_bytes, schema_overrides={'order_id': order_dtype, 'product': pl.Categorical})
+            .select('order_id', 'product')
+            .drop_nulls()
+            .unique(maintain_order=True)
+            .collect(engine=engine))
+
+@st.cache_data
+def load_baskets(_file_bytes, file_key):
+    """
+    Reads the uploaded CSV identified by file_key into factorized (order, product) codes.
+    Returns (order_idx, product_idx, n_orders, products).
+    """
+    try:
+        pairs = scan_pairs(_file_bytes, pl.Int32)
+    except pl.exceptions.ComputeError:
+        # Order ids that aren't 32-bit integers are kept as categories instead
+        pairs = scan_pairs(_file_bytes, pl.Categorical)
+    # Factorize the categorical integer codes rather than the strings; the distinct
+    # names in first-appearance order line up with factorize's first-appearance codes
+    order_idx, orders = pd.factorize(pairs['order_id'].to_physical().to_numpy())
+    product_idx, _ = pd.factorize(pairs['product'].to_physical().to_numpy())
+    products = pairs['product'].unique(maintain_order=True).to_numpy()
+    # str() so the rules text join also works for numeric product codes; both miners
+    # build itemsets by indexing this one array, so names are shared, not copied
+    products = np.array([str(p) for p in products], dtype=object)
+    # int32 codes halve the index arrays every basket layout is built from
+    return order_idx.astype(np.int32), product_idx.astype(np.int32), len(orders), products
+
+# ---------------------------
+# Helper: Mine itemsets and rules
+# ---------------------------
+# Bump whenever the mined itemsets/rules frames change shape, so results
+# persisted by an older version are never served
+RESULTS_VERSION = 1
+
+@st.cache_resource
+def get_disk_cache():
+    """
+    Opens the on-disk cache next to this script once per server process.
+    """
+    return diskcache.Cache(Path(__file__).with_name('.cache'))
+
+def persisted(key, compute):
+    """
+    Returns the value stored on disk under key, computing and storing it on a miss.
+    """
+    disk_cache = get_disk_cache()
+    value = disk_cache.get(key)
+    if value is None:
+        value = compute()
+        disk_cache.set(key, value)
+    return value
+
+@st.cache_data
+def mine_itemsets(_baskets, file_key, min_support, algorithm):
+    """
+    Finds the frequent itemsets in the baskets identified by file_key.
+    """
+    return persisted(('itemsets', RESULTS_VERSION, file_key, min_support, algorithm),
+                     lambda: find_itemsets(_baskets, min_support, algorithm))
+
+@st.cache_data
+def mine_rules(_frequent_itemsets, file_key, min_support, algorithm, min_confidence, min_lift):
+    """
+    Generates association rules from the itemsets mined for (file_key, min_support, algorithm).
+    """
+    return persisted(('rules', RESULTS_VERSION, file_key, min_support, algorithm, min_confidence, min_lift),
+                     lambda: generate_rules(_frequent_itemsets, min_confidence, min_lift))
 
 # ---------------------------
 # Helper: Draw network graph
 # ---------------------------
-def draw_network(rules, selected_metric="confidence", min_val=0.5):
+@st.cache_data
+def metric_bounds(_rules, rules_key, metric):
     """
-    Creates an interactive network graph from the association rules.
+    Returns the (min, max) of a metric over the rules identified by rules_key.
     """
-    G = nx.DiGraph()
-    filtered_rules = rules[rules[selected_metric] >= min_val]
-    
-    for _, row in filtered_rules.iterrows():
-        antecedents = list(row['antecedents'])
-        consequents = list(row['consequents'])
-        
-        for ant in antecedents:
-            for cons in consequents:
-                G.add_edge(ant, cons, weight=row[selected_metric], title=f"Lift: {row['lift']:.2f}")
+    return float(_rules[metric].min()), float(_rules[metric].max())
+
+@st.cache_data
+def graph_layout(edge_list):
+    """
+    Computes fixed node positions for the graph spanned by edge_list.
+    """
+    pos = nx.spring_layout(nx.DiGraph(list(edge_list)), seed=42)
+    return {node: (float(x) * 1000, float(y) * 1000) for node, (x, y) in pos.items()}
+
+@st.cache_data
+def build_network_html(_rules, rules_key, selected_metric="confidence", min_val=0.5):
+    """
+    Renders the interactive network graph of the rules identified by rules_key as HTML.
+    """
+    filtered_rules = _rules[_rules[selected_metric] >= min_val]
+
+    # One row per (antecedent item, consequent item) pair
+    edges = (filtered_rules[['antecedents', 'consequents']]
+             .assign(antecedents=lambda d: d['antecedents'].map(list),
+                     consequents=lambda d: d['consequents'].map(list),
+                     weight=filtered_rules[selected_metric],
+                     title=filtered_rules['lift'].map('Lift: {:.2f}'.format))
+             .explode('antecedents').explode('consequents'))
+    G = nx.from_pandas_edgelist(edges, 'antecedents', 'consequents',
+                                edge_attr=['weight', 'title'], create_using=nx.DiGraph)
+    # Lay out once on the server so the browser doesn't run a physics simulation
+    pos = graph_layout(tuple(G.edges()))
+    nx.set_node_attributes(G, {node: {'x': x, 'y': y, 'physics': False} for node, (x, y) in pos.items()})
 
     net = Network(height="550px", width="100%", bgcolor="#FFFFFF", font_color="Black", directed=True, notebook=False)
     net.from_nx(G)
-    net.repulsion(node_distance=420, central_gravity=0.33, spring_length=110, spring_strength=0.10, damping=0.95)
-    
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".html") as tmp_file:
-        net.save_graph(tmp_file.name)
-        with open(tmp_file.name, 'r', encoding='utf-8') as html_file:
-            components.html(html_file.read(), height=575)
+    net.toggle_physics(False)
+    return net.generate_html(notebook=False)
 
 # ---------------------------
 # Streamlit App
@@ -42,22 +145,21 @@ st.title("🛒 Market Basket Analysis Dashboard")
 uploaded_file = st.file_uploader("Upload your transaction data (CSV file)", type=["csv"])
 
 if uploaded_file:
-    df = pd.read_csv(uploaded_file)
-
-    basket = (df.groupby(['order_id', 'product'])['product']
-              .count().unstack().reset_index().fillna(0)
-              .set_index('order_id'))
-    
-    basket_sets = (basket > 0).astype(int)
+    file_bytes = uploaded_file.getvalue()
+    file_key = hashlib.md5(file_bytes).hexdigest()
+    baskets = load_baskets(file_bytes, file_key)
 
     st.sidebar.header("Algorithm Parameters")
+    algorithm = st.sidebar.radio("Algorithm", ["fpgrowth", "apriori"], index=0)
     min_support = st.sidebar.slider("Minimum Support", 0.01, 0.5, 0.02, 0.01)
     min_confidence = st.sidebar.slider("Minimum Confidence", 0.1, 1.0, 0.2, 0.05)
     min_lift = st.sidebar.slider("Minimum Lift", 1.0, 5.0, 1.0, 0.1)
+    top_n = st.sidebar.slider("Top Rules", 10, 500, 100)
 
-    frequent_itemsets = apriori(basket_sets, min_support=min_support, use_colnames=True)
-    rules = association_rules(frequent_itemsets, metric="confidence", min_threshold=min_confidence)
-    rules = rules[rules['lift'] >= min_lift]
+    # Each tier is cached separately, so confidence/lift changes never re-mine
+    frequent_itemsets = mine_itemsets(baskets, file_key, min_support, algorithm)
+    rules = mine_rules(frequent_itemsets, file_key, min_support, algorithm, min_confidence, min_lift)
+    rules_key = (file_key, min_support, algorithm, min_confidence, min_lift)
 
     # --- Display Results ---
     st.markdown("---")
@@ -65,11 +167,13 @@ if uploaded_file:
         st.warning("No association rules found for the selected parameters. Please try lowering the thresholds in the sidebar.")
     else:
         st.subheader("📊 Top Association Rules")
-        display_rules = rules.copy()
-        display_rules['antecedents'] = display_rules['antecedents'].apply(lambda a: ', '.join(list(a)))
-        display_rules['consequents'] = display_rules['consequents'].apply(lambda a: ', '.join(list(a)))
-        
-        st.dataframe(display_rules[['antecedents', 'consequents', 'support', 'confidence', 'lift']].sort_values('lift', ascending=False))
+        # Partial sort: only the top_n rules by lift reach the table and the graph
+        top_rules = rules.nlargest(top_n, 'lift')
+        top_key = (*rules_key, top_n)
+        display_rules = (rules.drop(columns=['antecedents', 'consequents'])
+                         .rename(columns={'antecedents_str': 'antecedents', 'consequents_str': 'consequents'}))
+
+        st.dataframe(display_rules.loc[top_rules.index, ['antecedents', 'consequents', 'support', 'confidence', 'lift']])
 
         @st.cache_data
         def convert_df_to_csv(df):
@@ -89,8 +193,7 @@ if uploaded_file:
         st.sidebar.header("Graph Parameters")
         metric_choice = st.sidebar.selectbox("Choose metric for edge weight:", ["confidence", "lift", "support"])
         
-        min_val_default = float(rules[metric_choice].min())
-        max_val_default = float(rules[metric_choice].max())
+        min_val_default, max_val_default = metric_bounds(top_rules, top_key, metric_choice)
         
         min_val = st.sidebar.slider(f"Minimum {metric_choice} to display:", 
                                     min_value=min_val_default, 
@@ -98,7 +201,8 @@ if uploaded_file:
                                     value=min_val_default, 
                                     step=0.01)
         
-        draw_network(rules, selected_metric=metric_choice, min_val=min_val)
+        components.html(build_network_html(top_rules, top_key, selected_metric=metric_choice, min_val=min_val),
+                        height=575)
 
 else:
     st.info("Awaiting for a CSV file to be uploaded.")
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+from mlxtend.frequent_patterns import association_rules
+
+from basket_mining import find_itemsets, generate_rules, prune_for_lift
+
+METRICS = ['antecedent support', 'consequent support', 'support', 'confidence', 'lift']
+
+def random_baskets(seed=0, n_orders=300, n_items=12):
+    """
+    Seeded baskets in load_baskets' (order_idx, product_idx, n_orders, products) form,
+    skewed towards the first few items so some pairs have high lift.
+    """
+    rng = np.random.default_rng(seed)
+    weights = np.linspace(3, 1, n_items)
+    order_idx, product_idx = [], []
+    for order in range(n_orders):
+        items = rng.choice(n_items, size=rng.integers(1, 7), replace=False, p=weights / weights.sum())
+        order_idx.extend([order] * len(items))
+        product_idx.extend(items)
+    products = np.array([f"p{i}" for i in range(n_items)], dtype=object)
+    return np.array(order_idx, dtype=np.int32), np.array(product_idx, dtype=np.int32), n_orders, products
+
+def unpruned_rules(frequent_itemsets, min_confidence, min_lift):
+    rules = association_rules(frequent_itemsets, metric="confidence", min_threshold=min_confidence)
+    return rules[rules['lift'] >= min_lift]
+
+def by_rule(rules):
+    return rules.set_index(['antecedents', 'consequents'])[METRICS].sort_index()
+
+@pytest.mark.parametrize("min_support", [0.02, 0.05, 0.1])
+@pytest.mark.parametrize("min_confidence", [0.1, 0.3, 0.6])
+@pytest.mark.parametrize("min_lift", [1.0, 1.2, 1.5, 2.0, 3.0])
+def test_pruned_rules_match_unpruned(min_support, min_confidence, min_lift):
+    frequent_itemsets = find_itemsets(random_baskets(), min_support, "fpgrowth")
+    expected = unpruned_rules(frequent_itemsets, min_confidence, min_lift)
+    actual = generate_rules(frequent_itemsets, min_confidence, min_lift)
+
+    if expected.empty:
+        # mlxtend leaves an empty frame's columns as object dtype, so only compare emptiness
+        assert actual.empty
+        return
+    pd.testing.assert_frame_equal(by_rule(actual), by_rule(expected))
+    assert actual['antecedents_str'].tolist() == [', '.join(sorted(a)) for a in actual['antecedents']]
+
+def test_pruning_drops_itemsets_at_high_lift():
+    frequent_itemsets = find_itemsets(random_baskets(), 0.02, "fpgrowth")
+    assert len(prune_for_lift(frequent_itemsets, 3.0)) < len(frequent_itemsets)
+
+def test_no_frequent_itemsets_gives_no_rules():
+    frequent_itemsets = find_itemsets(random_baskets(), 0.99, "fpgrowth")
+    assert frequent_itemsets.empty
+    assert prune_for_lift(frequent_itemsets, 1.0).empty
+    assert generate_rules(frequent_itemsets, 0.2, 1.0).empty
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+from mlxtend.frequent_patterns import apriori
+
+from bitset_apriori import pack_baskets, frequent_itemsets
+
+def random_baskets(seed=0, n_orders=400, n_items=150):
+    """
+    Seeded baskets over more than 64 items, so masks span several words;
+    half the orders draw from the first 20 items to give deeper itemsets.
+    """
+    rng = np.random.default_rng(seed)
+    order_idx, product_idx = [], []
+    for order in range(n_orders):
+        pool = 20 if order % 2 else n_items
+        items = rng.choice(pool, size=rng.integers(1, 9), replace=False)
+        order_idx.extend([order] * len(items))
+        product_idx.extend(items)
+    return np.array(order_idx, dtype=np.int32), np.array(product_idx, dtype=np.int32), n_orders, n_items
+
+@pytest.mark.parametrize("min_support", [0.01, 0.02])
+def test_matches_mlxtend_apriori(min_support):
+    order_idx, product_idx, n_orders, n_items = random_baskets()
+    basket = np.zeros((n_orders, n_items), dtype=bool)
+    basket[order_idx, product_idx] = True
+    expected = apriori(pd.DataFrame(basket), min_support=min_support)
+    expected = {frozenset(items): support for items, support in zip(expected['itemsets'], expected['support'])}
+
+    words = pack_baskets(order_idx, product_idx, n_orders, n_items)
+    levels = frequent_itemsets(words, product_idx, n_items, min_support)
+    actual = {frozenset(items.tolist()): count / n_orders
+              for itemsets, counts in levels for items, count in zip(itemsets, counts)}
+
+    assert max(len(items) for items in actual) >= 3
+    assert actual.keys() == expected.keys()
+    assert all(actual[items] == pytest.approx(expected[items]) for items in expected)